@@ -166,8 +166,8 @@ class Calculation:
             saved_result = Decimal(data['result'])
             if calc.result != saved_result:
                 logging.warning(
-                    f"Loaded calculation result {saved_result} "
-                    f"differs from computed result {calc.result}"
+                    "Loaded calculation result %s differs from computed result %s",
+                    saved_result, calc.result
                 )  # pragma: no cover
 
             return calc
@@ -8,8 +8,6 @@ import os
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Union
 
-import pandas as pd
-
 from app.calculation import Calculation
 from app.calculator_config import CalculatorConfig
 from app.calculator_memento import CalculatorMemento
@@ -22,6 +20,24 @@ from app.operations import Operation
 Number = Union[int, float, Decimal]
 CalculationResult = Union[Number, str]
 
+# pandas is only needed to save, load or export history, and importing it is
+# the slowest part of loading this module, so it is imported on first use
+pd = None
+
+
+def _pandas():
+    """
+    Import pandas on first use.
+
+    Returns:
+        module: The pandas module, cached in the module-level pd name.
+    """
+    global pd
+    if pd is None:
+        import pandas
+        pd = pandas
+    return pd
+
 
 class Calculator:
     """
@@ -76,7 +92,7 @@ class Calculator:
             self.load_history()
         except Exception as e:
             # Log a warning if history could not be loaded
-            logging.warning(f"Could not load existing history: {e}")
+            logging.warning("Could not load existing history: %s", e)
 
         # Log the successful initialization of the calculator
         logging.info("Calculator initialized with configuration")
@@ -99,7 +115,7 @@ class Calculator:
                 format='%(asctime)s - %(levelname)s - %(message)s',
                 force=True  # Overwrite any existing logging configuration
             )
-            logging.info(f"Logging initialized at: {log_file}")
+            logging.info("Logging initialized at: %s", log_file)
         except Exception as e:
             # Print an error message and re-raise the exception if logging setup fails
             print(f"Error setting up logging: {e}")
@@ -124,7 +140,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be added.
         """
         self.observers.append(observer)
-        logging.info(f"Added observer: {observer.__class__.__name__}")
+        logging.info("Added observer: %s", observer.__class__.__name__)
 
     def remove_observer(self, observer: HistoryObserver) -> None:
         """
@@ -136,7 +152,7 @@ class Calculator:
             observer (HistoryObserver): The observer to be removed.
         """
         self.observers.remove(observer)
-        logging.info(f"Removed observer: {observer.__class__.__name__}")
+        logging.info("Removed observer: %s", observer.__class__.__name__)
 
     def notify_observers(self, calculation: Calculation) -> None:
         """
@@ -163,7 +179,7 @@ class Calculator:
             operation (Operation): The operation strategy to be set.
         """
         self.operation_strategy = operation
-        logging.info(f"Set operation: {operation}")
+        logging.info("Set operation: %s", operation)
 
     def perform_operation(
         self,
@@ -215,8 +231,7 @@ class Calculator:
             self.history.append(calculation)
 
             # Ensure the history does not exceed the maximum size
-            if len(self.history) > self.config.max_history_size:
-                self.history.pop(0)
+            self._trim_history()
 
             # Notify all observers about the new calculation
             self.notify_observers(calculation)
@@ -225,29 +240,48 @@ class Calculator:
 
         except ValidationError as e:
             # Log and re-raise validation errors
-            logging.error(f"Validation error: {str(e)}")
+            logging.error("Validation error: %s", e)
             raise
         except Exception as e:
             # Log and raise operation errors for any other exceptions
-            logging.error(f"Operation failed: {str(e)}")
+            logging.error("Operation failed: %s", e)
             raise OperationError(f"Operation failed: {str(e)}")
 
-    def save_history(self) -> None:
+    def _trim_history(self) -> None:
+        """
+        Enforce the maximum history size.
+
+        Drops the oldest calculations until the history fits within
+        max_history_size.
+        """
+        excess = len(self.history) - self.config.max_history_size
+        if excess > 0:
+            del self.history[:excess]
+
+    def save_history(self, history: Optional[List[Calculation]] = None) -> None:
         """
         Save calculation history to a CSV file using pandas.
 
         Serializes the history of calculations and writes them to a CSV file for
         persistent storage. Utilizes pandas DataFrames for efficient data handling.
 
+        Args:
+            history (Optional[List[Calculation]], optional): Snapshot of calculations
+                to write. Defaults to the calculator's current history.
+
         Raises:
             OperationError: If saving the history fails.
         """
+        if history is None:
+            history = self.history
+
+        pd = _pandas()
         try:
             # Ensure the history directory exists
             self.config.history_dir.mkdir(parents=True, exist_ok=True)
 
             history_data = []
-            for calc in self.history:
+            for calc in history:
                 # Serialize each Calculation instance to a dictionary
                 history_data.append({
                     'operation': str(calc.operation),
@@ -262,7 +296,7 @@ class Calculator:
                 df = pd.DataFrame(history_data)
                 # Write the DataFrame to a CSV file without the index
                 df.to_csv(self.config.history_file, index=False)
-                logging.info(f"History saved successfully to {self.config.history_file}")
+                logging.info("History saved successfully to %s", self.config.history_file)
             else:
                 # If history is empty, create an empty CSV with headers
                 pd.DataFrame(columns=['operation', 'operand1', 'operand2', 'result', 'timestamp']
@@ -271,7 +305,7 @@ class Calculator:
 
         except Exception as e:
             # Log and raise an OperationError if saving fails
-            logging.error(f"Failed to save history: {e}")
+            logging.error("Failed to save history: %s", e)
             raise OperationError(f"Failed to save history: {e}")
 
     def load_history(self) -> None:
@@ -286,6 +320,7 @@ class Calculator:
         """
         try:
             if self.config.history_file.exists():
+                pd = _pandas()
                 # Read the CSV file into a pandas DataFrame
                 df = pd.read_csv(self.config.history_file)
                 if not df.empty:
@@ -300,7 +335,7 @@ class Calculator:
                         })
                         for _, row in df.iterrows()
                     ]
-                    logging.info(f"Loaded {len(self.history)} calculations from history")
+                    logging.info("Loaded %d calculations from history", len(self.history))
                 else:
                     logging.info("Loaded empty history file")
             else:
@@ -308,10 +343,10 @@ class Calculator:
                 logging.info("No history file found - starting with empty history")
         except Exception as e:
             # Log and raise an OperationError if loading fails
-            logging.error(f"Failed to load history: {e}")
+            logging.error("Failed to load history: %s", e)
             raise OperationError(f"Failed to load history: {e}")
 
-    def get_history_dataframe(self) -> pd.DataFrame:
+    def get_history_dataframe(self) -> 'pd.DataFrame':
         """
         Get calculation history as a pandas DataFrame.
 
@@ -330,7 +365,7 @@ class Calculator:
                 'result': str(calc.result),
                 'timestamp': calc.timestamp
             })
-        return pd.DataFrame(history_data)
+        return _pandas().DataFrame(history_data)
 
     def show_history(self) -> List[str]:
         """
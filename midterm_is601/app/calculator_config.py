@@ -53,7 +53,11 @@ class CalculatorConfig:
         auto_save: Optional[bool] = None,
         precision: Optional[int] = None,
         max_input_value: Optional[Number] = None,
-        default_encoding: Optional[str] = None
+        default_encoding: Optional[str] = None,
+        log_dir: Optional[Path] = None,
+        history_dir: Optional[Path] = None,
+        history_file: Optional[Path] = None,
+        log_file: Optional[Path] = None
     ):
         """
         Initialize configuration with environment variables and defaults.
@@ -65,6 +69,10 @@ class CalculatorConfig:
             precision (Optional[int], optional): Number of decimal places for calculations. Defaults to None.
             max_input_value (Optional[Number], optional): Maximum allowed input value. Defaults to None.
             default_encoding (Optional[str], optional): Default encoding for file operations. Defaults to None.
+            log_dir (Optional[Path], optional): Log directory, overriding the environment and base_dir. Defaults to None.
+            history_dir (Optional[Path], optional): History directory, overriding the environment and base_dir. Defaults to None.
+            history_file (Optional[Path], optional): History file, overriding the environment and history_dir. Defaults to None.
+            log_file (Optional[Path], optional): Log file, overriding the environment and log_dir. Defaults to None.
         """
         # Set base directory to project root by default
         project_root = get_project_root()
@@ -98,6 +106,13 @@ class CalculatorConfig:
             'CALCULATOR_DEFAULT_ENCODING', 'utf-8'
         )
 
+        # Explicit file locations; when unset the properties below fall back
+        # to environment variables and then to paths under base_dir
+        self._log_dir = Path(log_dir).resolve() if log_dir else None
+        self._history_dir = Path(history_dir).resolve() if history_dir else None
+        self._history_file = Path(history_file).resolve() if history_file else None
+        self._log_file = Path(log_file).resolve() if log_file else None
+
     @property
     def log_dir(self) -> Path:
         """
@@ -108,6 +123,8 @@ class CalculatorConfig:
         Returns:
             Path: The log directory path.
         """
+        if self._log_dir is not None:
+            return self._log_dir
         return Path(os.getenv(
             'CALCULATOR_LOG_DIR',
             str(self.base_dir / "logs")
@@ -123,6 +140,8 @@ class CalculatorConfig:
         Returns:
             Path: The history directory path.
         """
+        if self._history_dir is not None:
+            return self._history_dir
         return Path(os.getenv(
             'CALCULATOR_HISTORY_DIR',
             str(self.base_dir / "history")
@@ -138,6 +157,8 @@ class CalculatorConfig:
         Returns:
             Path: The history file path.
         """
+        if self._history_file is not None:
+            return self._history_file
         return Path(os.getenv(
             'CALCULATOR_HISTORY_FILE',
             str(self.history_dir / "calculator_history.csv")
@@ -153,6 +174,8 @@ class CalculatorConfig:
         Returns:
             Path: The log file path.
         """
+        if self._log_file is not None:
+            return self._log_file
         return Path(os.getenv(
             'CALCULATOR_LOG_FILE',
             str(self.log_dir / "calculator.log")
@@ -2,231 +2,392 @@
 # Calculator REPL       #
 ########################
 
+from collections import defaultdict
 from decimal import Decimal
 import logging
+from typing import Optional
 
 from app.calculator import Calculator
 from app.exceptions import OperationError, ValidationError
-from app.history import AutoSaveObserver, LoggingObserver
+from app.history import BufferedAutoSaveObserver, LoggingObserver
 from app.operations import OperationFactory
 from colorama import Fore, Style, init
 
-def calculator_repl():
+# Error color escape, bound once instead of looked up on every error message
+_RED = Fore.RED
+
+# Command abbreviation mapping
+_COMMAND_ALIASES = {
+    # Arithmetic operations abbreviations
+    'a': 'add',
+    '+': 'add',
+    's': 'subtract',
+    'sub': 'subtract',
+    '-': 'subtract',
+    'm': 'multiply',
+    'mul': 'multiply',
+    '*': 'multiply',
+    'd': 'divide',
+    'div': 'divide',
+    '/': 'divide',
+    'p': 'power',
+    'pow': 'power',
+    '^': 'power',
+    '**': 'power',
+    'mod': 'modulus',
+    '%': 'modulus',
+    'id': 'integer_division',
+    'idiv': 'integer_division',
+    '//': 'integer_division',
+    'per': 'percentage',
+    'pct': 'percentage',
+    'ad': 'absolute_difference',
+    'abs': 'absolute_difference',
+    'absdiff': 'absolute_difference',
+    'r': 'root',
+    'rt': 'root',
+    # System commands abbreviations
+    'h': 'help',
+    '?': 'help',
+    'q': 'exit',
+    'quit': 'exit',
+    'x': 'exit',
+    'hist': 'history',
+    'c': 'clear',
+    'u': 'undo',
+    'z': 'redo',
+}
+
+# Arithmetic commands and their help descriptions, in display order
+_ARITH_DESCRIPTIONS = {
+    'add': 'Addition',
+    'subtract': 'Subtraction',
+    'multiply': 'Multiplication',
+    'divide': 'Division',
+    'power': 'Exponentiation',
+    'modulus': 'Remainder after division',
+    'integer_division': 'Integer division',
+    'percentage': 'Calculate percentage',
+    'absolute_difference': 'Absolute difference',
+    'root': 'Calculate nth root',
+}
+
+# System commands and their help descriptions, in display order
+_SYSTEM_DESCRIPTIONS = {
+    'help': 'Show this help',
+    'history': 'Show calculation history',
+    'clear': 'Clear calculation history',
+    'undo': 'Undo the last calculation',
+    'redo': 'Redo the last undone calculation',
+    'save': 'Save calculation history to file',
+    'load': 'Load calculation history from file',
+    'exit': 'Exit the calculator',
+}
+
+# Commands that prompt for two operands and run an arithmetic operation
+_ARITH_COMMANDS = frozenset(_ARITH_DESCRIPTIONS)
+
+
+def _build_help_text() -> str:
+    """
+    Render the help listing.
+
+    Abbreviations are looked up from _COMMAND_ALIASES so the help text cannot
+    drift from the aliases the REPL actually accepts.
+
+    Returns:
+        str: The full help text.
+    """
+    aliases_by_command = defaultdict(list)
+    for alias, command in _COMMAND_ALIASES.items():
+        aliases_by_command[command].append(alias)
+
+    def entry(command: str, description: str) -> str:
+        aliases = aliases_by_command.get(command)
+        if aliases:
+            return f"    {command} ({', '.join(aliases)}) - {description}"
+        return f"    {command} - {description}"
+
+    lines = ["\nAvailable commands:", "  Arithmetic Operations:"]
+    lines.extend(entry(command, text) for command, text in _ARITH_DESCRIPTIONS.items())
+    lines.append("  System Commands:")
+    lines.extend(entry(command, text) for command, text in _SYSTEM_DESCRIPTIONS.items())
+    return "\n".join(lines)
+
+
+# Help text shown by the help command, built once at import
+_HELP_TEXT = _build_help_text()
+
+
+def _is_cancel(value: str) -> bool:
+    """Return True if an operand prompt answer asks to cancel the operation."""
+    return value.strip().casefold() == 'cancel'
+
+
+def _flush_autosave(calc: Calculator) -> None:
+    """Persist calculations buffered by auto-save observers and wait for the write."""
+    for observer in calc.observers:
+        if isinstance(observer, BufferedAutoSaveObserver):
+            observer.flush(wait=True)
+
+
+def _close_autosave(calc: Calculator) -> bool:
+    """
+    Persist buffered calculations and stop any background history writers.
+
+    Returns:
+        bool: True if every writer stopped, False if one is still running.
+    """
+    stopped = True
+    for observer in calc.observers:
+        if isinstance(observer, BufferedAutoSaveObserver):
+            stopped = observer.close() and stopped
+    return stopped
+
+
+def _cmd_help(calc: Calculator) -> bool:
+    """Display available commands."""
+    print(_HELP_TEXT)
+    return False
+
+
+def _cmd_exit(calc: Calculator) -> bool:
+    """Attempt to save history, then signal the REPL to stop."""
+    try:
+        # Stop the background writer first so it cannot overwrite the final save
+        if _close_autosave(calc):
+            calc.save_history()
+            print("History saved successfully.")
+        else:
+            print(f"{_RED}Warning: Could not save history: background writer is still running")
+    except Exception as e:
+        print(f"{_RED}Warning: Could not save history: {e}")
+    print("Goodbye!")
+    return True
+
+
+def _cmd_history(calc: Calculator) -> bool:
+    """Display calculation history."""
+    history = calc.show_history()
+    if not history:
+        print("No calculations in history")
+    else:
+        # Build the listing up front so it is written in one call
+        lines = [f"{i}. {entry}" for i, entry in enumerate(history, 1)]
+        print("\nCalculation History:\n" + "\n".join(lines))
+    return False
+
+
+def _cmd_clear(calc: Calculator) -> bool:
+    """Clear calculation history."""
+    calc.clear_history()
+    print("History cleared")
+    return False
+
+
+def _cmd_undo(calc: Calculator) -> bool:
+    """Undo the last calculation."""
+    if calc.undo():
+        print("Operation undone")
+    else:
+        print("Nothing to undo")
+    return False
+
+
+def _cmd_redo(calc: Calculator) -> bool:
+    """Redo the last undone calculation."""
+    if calc.redo():
+        print("Operation redone")
+    else:
+        print("Nothing to redo")
+    return False
+
+
+def _cmd_save(calc: Calculator) -> bool:
+    """Save calculation history to file."""
+    try:
+        # Let queued auto-saves finish so an older snapshot cannot overwrite this save
+        _flush_autosave(calc)
+        calc.save_history()
+        print("History saved successfully") # pragma: no cover
+    except Exception as e:
+        print(f"{_RED}Error saving history: {e}")
+    return False
+
+
+def _cmd_load(calc: Calculator) -> bool:
+    """Load calculation history from file."""
+    try:
+        # Save buffered calculations before the loaded history replaces them
+        _flush_autosave(calc)
+        calc.load_history()
+        print("History loaded successfully")
+    except Exception as e:
+        print(f"{_RED}Error loading history: {e}")
+    return False
+
+
+def _cmd_arith(calc: Calculator, command: str) -> None:
+    """Prompt for two operands and perform the specified arithmetic operation."""
+    try:
+        print("\nEnter numbers (or 'cancel' to abort):")
+        a = input("First number: ")
+        if _is_cancel(a):
+            print("Operation cancelled")
+            return
+        b = input("Second number: ")
+        if _is_cancel(b):
+            print("Operation cancelled")
+            return
+
+        # Create the appropriate operation instance using the Factory pattern
+        operation = OperationFactory.create_operation(command)
+        calc.set_operation(operation)
+
+        # Perform the calculation
+        result = calc.perform_operation(a, b)
+
+        # Format the result with configured precision
+        if isinstance(result, Decimal):
+            try:
+                # Round to configured precision in fixed-point notation,
+                # then drop trailing zeros
+                formatted_result = format(result, f'.{calc.config.precision}f')
+                if '.' in formatted_result:
+                    formatted_result = formatted_result.rstrip('0').rstrip('.')
+            except:# pragma: no cover
+                # Fallback if formatting fails
+                formatted_result = str(result)
+        else:
+            formatted_result = str(result)
+
+        print(f"\nResult: {formatted_result}")
+    except KeyboardInterrupt:
+        # Ctrl+C at a number prompt cancels just this operation
+        print(f"\n{_RED}Operation cancelled")
+    except (ValidationError, OperationError) as e:
+        # Handle known exceptions related to validation or operation errors
+        print(f"{_RED}Error: {e}")
+    except Exception as e:
+        # Handle any unexpected exceptions
+        print(f"{_RED}Unexpected error: {e}")
+
+
+# Dispatch table mapping system commands to their handlers.
+# Each handler returns True when the REPL should stop.
+_DISPATCH = {
+    'help': _cmd_help,
+    'exit': _cmd_exit,
+    'history': _cmd_history,
+    'clear': _cmd_clear,
+    'undo': _cmd_undo,
+    'redo': _cmd_redo,
+    'save': _cmd_save,
+    'load': _cmd_load,
+}
+
+
+def _dispatch(command: str, calc: Calculator) -> bool:
+    """
+    Run a single command line against the calculator.
+
+    Args:
+        command (str): The command as entered by the user.
+        calc (Calculator): Calculator the command operates on.
+
+    Returns:
+        bool: True if the REPL should stop, False otherwise.
+    """
+    command = command.strip()
+
+    # Blank lines just re-prompt
+    if not command:
+        return False
+
+    # Resolve command aliases/abbreviations
+    command = command.lower()
+    command = _COMMAND_ALIASES.get(command, command)
+
+    handler = _DISPATCH.get(command)
+    if handler is not None:
+        return handler(calc)
+
+    if command in _ARITH_COMMANDS:
+        _cmd_arith(calc, command)
+        return False
+
+    # Handle unknown commands
+    print(f"{_RED}Unknown command: '{command}'. Type 'help' for available commands.")
+    return False
+
+
+def _build_calculator() -> Calculator:
+    """
+    Create a Calculator with the default observers registered.
+
+    Returns:
+        Calculator: A calculator that logs and auto-saves each calculation.
+    """
+    calc = Calculator()
+
+    # Register observers for logging and auto-saving history
+    calc.add_observer(LoggingObserver())
+    calc.add_observer(BufferedAutoSaveObserver(calc, background=True))
+    return calc
+
+
+def calculator_repl(calc: Optional[Calculator] = None):
     """
     Command-line interface for the calculator.
 
     Implements a Read-Eval-Print Loop (REPL) that continuously prompts the user
     for commands, processes arithmetic operations, and manages calculation history.
+
+    Args:
+        calc (Optional[Calculator], optional): Calculator to drive. When omitted,
+            a new one is built with the logging and auto-save observers attached.
     """
     try:
         # Initialize colorama for cross-platform colored terminal output
         init(autoreset=True)
-        
-        # Initialize the Calculator instance
-        calc = Calculator()
-
-        # Register observers for logging and auto-saving history
-        calc.add_observer(LoggingObserver())
-        calc.add_observer(AutoSaveObserver(calc))
-
-        # Command abbreviation mapping
-        command_aliases = {
-            # Arithmetic operations abbreviations
-            'a': 'add',
-            '+': 'add',
-            's': 'subtract',
-            'sub': 'subtract',
-            '-': 'subtract',
-            'm': 'multiply',
-            'mul': 'multiply',
-            '*': 'multiply',
-            'd': 'divide',
-            'div': 'divide',
-            '/': 'divide',
-            'p': 'power',
-            'pow': 'power',
-            '^': 'power',
-            '**': 'power',
-            'mod': 'modulus',
-            '%': 'modulus',
-            'id': 'integer_division',
-            'idiv': 'integer_division',
-            '//': 'integer_division',
-            'per': 'percentage',
-            'pct': 'percentage',
-            'ad': 'absolute_difference',
-            'abs': 'absolute_difference',
-            'absdiff': 'absolute_difference',
-            'r': 'root',
-            'rt': 'root',
-            # System commands abbreviations
-            'h': 'help',
-            '?': 'help',
-            'q': 'exit',
-            'quit': 'exit',
-            'x': 'exit',
-            'hist': 'history',
-            'c': 'clear',
-            'u': 'undo',
-            'z': 'redo',
-        }
+
+        # Reuse the supplied Calculator, or build one with its observers
+        if calc is None:
+            calc = _build_calculator()
 
         print("Calculator started. Type 'help' for commands.")
 
         while True:
             try:
-                # Prompt the user for a command
-                command = input("\nEnter command: ").lower().strip()
-
-                # Resolve command aliases/abbreviations
-                original_command = command
-                command = command_aliases.get(command, command)
-
-                if command == 'help':
-                    # Display available commands
-                    print("\nAvailable commands:")
-                    print("  Arithmetic Operations:")
-                    print("    add (a, +) - Addition")
-                    print("    subtract (s, sub, -) - Subtraction")
-                    print("    multiply (m, mul, *) - Multiplication")
-                    print("    divide (d, div, /) - Division")
-                    print("    power (p, pow, ^, **) - Exponentiation")
-                    print("    modulus (mod, %) - Remainder after division")
-                    print("    integer_division (id, idiv, //) - Integer division")
-                    print("    percentage (per, pct) - Calculate percentage")
-                    print("    absolute_difference (ad, abs, absdiff) - Absolute difference")
-                    print("    root (r, rt) - Calculate nth root")
-                    print("  System Commands:")
-                    print("    help (h, ?) - Show this help")
-                    print("    history (hist) - Show calculation history")
-                    print("    clear (c) - Clear calculation history")
-                    print("    undo (u) - Undo the last calculation")
-                    print("    redo (z) - Redo the last undone calculation")
-                    print("    save - Save calculation history to file")
-                    print("    load - Load calculation history from file")
-                    print("    exit (q, quit, x) - Exit the calculator")
-                    continue
-
-                if command == 'exit':
-                    # Attempt to save history before exiting
-                    try:
-                        calc.save_history()
-                        print("History saved successfully.")
-                    except Exception as e:
-                        print(f"{Fore.RED}Warning: Could not save history: {e}")
-                    print("Goodbye!")
+                # Prompt the user for a command and run it
+                command = input("\nEnter command: ")
+                if _dispatch(command, calc):
                     break
-
-                if command == 'history':
-                    # Display calculation history
-                    history = calc.show_history()
-                    if not history:
-                        print("No calculations in history")
-                    else:
-                        print("\nCalculation History:")
-                        for i, entry in enumerate(history, 1):
-                            print(f"{i}. {entry}")
-                    continue
-
-                if command == 'clear':
-                    # Clear calculation history
-                    calc.clear_history()
-                    print("History cleared")
-                    continue
-
-                if command == 'undo':
-                    # Undo the last calculation
-                    if calc.undo():
-                        print("Operation undone")
-                    else:
-                        print("Nothing to undo")
-                    continue
-
-                if command == 'redo':
-                    # Redo the last undone calculation
-                    if calc.redo():
-                        print("Operation redone")
-                    else:
-                        print("Nothing to redo")
-                    continue
-
-                if command == 'save':
-                    # Save calculation history to file
-                    try:
-                        calc.save_history()
-                        print("History saved successfully") # pragma: no cover
-                    except Exception as e:
-                        print(f"{Fore.RED}Error saving history: {e}")
-                    continue
-
-                if command == 'load':
-                    # Load calculation history from file
-                    try:
-                        calc.load_history()
-                        print("History loaded successfully")
-                    except Exception as e:
-                        print(f"{Fore.RED}Error loading history: {e}")
-                    continue
-
-                if command in ['add', 'subtract', 'multiply', 'divide', 'power', 'modulus', 'integer_division', 'percentage', 'absolute_difference', 'root']:
-                    # Perform the specified arithmetic operation
-                    try:
-                        print("\nEnter numbers (or 'cancel' to abort):")
-                        a = input("First number: ")
-                        if a.lower() == 'cancel':
-                            print("Operation cancelled")
-                            continue
-                        b = input("Second number: ")
-                        if b.lower() == 'cancel':
-                            print("Operation cancelled")
-                            continue
-
-                        # Create the appropriate operation instance using the Factory pattern
-                        operation = OperationFactory.create_operation(command)
-                        calc.set_operation(operation)
-
-                        # Perform the calculation
-                        result = calc.perform_operation(a, b)
-
-                        # Format the result with configured precision
-                        if isinstance(result, Decimal):
-                            try:
-                                # Format result to configured precision
-                                precision_pattern = Decimal('0.' + '0' * calc.config.precision)
-                                formatted_result = str(result.quantize(precision_pattern).normalize())
-                            except:# pragma: no cover
-                                # Fallback if quantize fails
-                                formatted_result = str(result)
-                        else:
-                            formatted_result = str(result)
-
-                        print(f"\nResult: {formatted_result}")
-                    except (ValidationError, OperationError) as e:
-                        # Handle known exceptions related to validation or operation errors
-                        print(f"{Fore.RED}Error: {e}")
-                    except Exception as e:
-                        # Handle any unexpected exceptions
-                        print(f"{Fore.RED}Unexpected error: {e}")
-                    continue
-
-                # Handle unknown commands
-                print(f"{Fore.RED}Unknown command: '{command}'. Type 'help' for available commands.")
-
             except KeyboardInterrupt:
                 # Handle Ctrl+C interruption gracefully
-                print(f"\n{Fore.RED}Operation cancelled")
+                print(f"\n{_RED}Operation cancelled")
                 continue
             except EOFError:
                 # Handle end-of-file (e.g., Ctrl+D) gracefully
-                print(f"\n{Fore.RED}Input terminated. Exiting...")
+                print(f"\n{_RED}Input terminated. Exiting...")
+                try:
+                    _close_autosave(calc)
+                except Exception as e:
+                    print(f"{_RED}Warning: Could not save history: {e}")
                 break
             except Exception as e:
-                # Handle any other unexpected exceptions
-                print(f"{Fore.RED}Error: {e}")
+                # Report a failed command and keep prompting
+                print(f"{_RED}Error: {e}")
                 continue
 
     except Exception as e:
         # Handle fatal errors during initialization
-        print(f"{Fore.RED}Fatal error: {e}")
-        logging.error(f"Fatal error in calculator REPL: {e}")
+        print(f"{_RED}Fatal error: {e}")
+        logging.error("Fatal error in calculator REPL: %s", e)
+        # Still persist buffered calculations and stop the background writer
+        if calc is not None:
+            try:
+                _close_autosave(calc)
+            except Exception as close_error:
+                logging.error("Could not save history after fatal error: %s", close_error)
         raise
@@ -4,7 +4,10 @@
 
 from abc import ABC, abstractmethod
 import logging
-from typing import Any
+import queue
+import threading
+import time
+from typing import Any, Optional
 from app.calculation import Calculation
 
 
@@ -49,9 +52,9 @@ class LoggingObserver(HistoryObserver):
         if calculation is None:
             raise AttributeError("Calculation cannot be None")
         logging.info(
-            f"Calculation performed: {calculation.operation} "
-            f"({calculation.operand1}, {calculation.operand2}) = "
-            f"{calculation.result}"
+            "Calculation performed: %s (%s, %s) = %s",
+            calculation.operation, calculation.operand1,
+            calculation.operand2, calculation.result
         )
 
 
@@ -94,3 +97,138 @@ class AutoSaveObserver(HistoryObserver):
         if self.calculator.config.auto_save:
             self.calculator.save_history()
             logging.info("History auto-saved")
+
+
+# Queue sentinel telling the background writer thread to stop
+_STOP_WRITER = object()
+
+
+class BufferedAutoSaveObserver(AutoSaveObserver):
+    """
+    Auto-save observer that coalesces saves across calculations.
+
+    Rather than rewriting the history file after every calculation, saves are
+    deferred until a number of calculations have accumulated or enough time has
+    passed since the last save. Call flush to persist anything still pending.
+
+    With background enabled, saves are handed to a writer thread as history
+    snapshots so the caller never waits on disk. Call close to drain it.
+    """
+
+    def __init__(
+        self,
+        calculator: Any,
+        flush_every: int = 20,
+        flush_interval: float = 2.0,
+        background: bool = False
+    ):
+        """
+        Initialize the BufferedAutoSaveObserver.
+
+        Args:
+            calculator (Any): The calculator instance to interact with.
+                Must have 'config' and 'save_history' attributes.
+            flush_every (int, optional): Number of pending calculations that
+                triggers a save. Defaults to 20.
+            flush_interval (float, optional): Seconds since the last save after
+                which the next calculation triggers a save. Defaults to 2.0.
+            background (bool, optional): Whether to write history on a daemon
+                thread. Defaults to False.
+
+        Raises:
+            TypeError: If the calculator does not have the required attributes.
+        """
+        super().__init__(calculator)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.pending = 0
+        self._last_flush = time.monotonic()
+
+        self._queue: Optional[queue.Queue] = None
+        self._worker: Optional[threading.Thread] = None
+        if background:
+            self._queue = queue.Queue()
+            self._worker = threading.Thread(
+                target=self._write_snapshots, args=(self._queue,), daemon=True
+            )
+            self._worker.start()
+
+    def update(self, calculation: Calculation) -> None:
+        """
+        Record a calculation and save once a threshold is reached.
+
+        Args:
+            calculation (Calculation): The calculation that was performed.
+        """
+        if calculation is None:
+            raise AttributeError("Calculation cannot be None")
+        if not self.calculator.config.auto_save:
+            return
+        self.pending += 1
+        if (self.pending >= self.flush_every or
+                time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self, wait: bool = False) -> None:
+        """
+        Save the calculation history if any calculations are pending.
+
+        Args:
+            wait (bool, optional): Block until the background writer has written
+                every queued snapshot. Defaults to False.
+        """
+        if self.pending:
+            if self._queue is not None:
+                self._queue.put(list(self.calculator.history))
+            else:
+                self.calculator.save_history()
+                logging.info("History auto-saved")
+            self.pending = 0
+            self._last_flush = time.monotonic()
+        if wait and self._queue is not None:
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> bool:
+        """
+        Flush pending calculations and stop the background writer.
+
+        Later saves, if any, are made synchronously. If the writer is still
+        running when the timeout expires it is left in place, so no other save
+        can race it.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the writer thread to
+                finish. Defaults to 5.0.
+
+        Returns:
+            bool: True if no background writer is left running, False otherwise.
+        """
+        self.flush()
+        if self._worker is not None:
+            self._queue.put(_STOP_WRITER)
+            self._worker.join(timeout)
+            if self._worker.is_alive():
+                logging.warning("Background auto-save writer did not stop within %s seconds", timeout)
+                return False
+            self._worker = None
+            self._queue = None
+        return True
+
+    def _write_snapshots(self, snapshots: queue.Queue) -> None:
+        """
+        Write queued history snapshots until told to stop.
+
+        Args:
+            snapshots (queue.Queue): Queue of history lists to save.
+        """
+        while True:
+            snapshot = snapshots.get()
+            try:
+                if snapshot is _STOP_WRITER:
+                    return
+                self.calculator.save_history(snapshot)
+                logging.info("History auto-saved")
+            except Exception as e:
+                logging.error("Background auto-save failed: %s", e)
+            finally:
+                snapshots.task_done()
@@ -402,6 +402,9 @@ class OperationFactory:
         'root': Root
     }
 
+    # Operations are stateless, so one shared instance per identifier is reused
+    _instances: Dict[str, Operation] = {}
+
     @classmethod
     def register_operation(cls, name: str, operation_class: type) -> None:
         """
@@ -419,6 +422,8 @@ class OperationFactory:
         if not issubclass(operation_class, Operation):
             raise TypeError("Operation class must inherit from Operation")
         cls._operations[name.lower()] = operation_class
+        # Drop any instance cached under this name so the new class is used
+        cls._instances.pop(name.lower(), None)
 
     @classmethod
     def create_operation(cls, operation_type: str) -> Operation:
@@ -426,7 +431,8 @@ class OperationFactory:
         Create an operation instance based on the operation type.
 
         This method retrieves the appropriate operation class from the
-        _operations dictionary and instantiates it.
+        _operations dictionary and instantiates it. Instances are cached per
+        operation type, so repeated calls return the same object.
 
         Args:
             operation_type (str): The type of operation to create (e.g., 'add').
@@ -437,7 +443,11 @@ class OperationFactory:
         Raises:
             ValueError: If the operation type is unknown.
         """
-        operation_class = cls._operations.get(operation_type.lower())
-        if not operation_class:
-            raise ValueError(f"Unknown operation: {operation_type}")
-        return operation_class()
+        key = operation_type.lower()
+        operation = cls._instances.get(key)
+        if operation is None:
+            operation_class = cls._operations.get(key)
+            if not operation_class:
+                raise ValueError(f"Unknown operation: {operation_type}")
+            operation = cls._instances[key] = operation_class()
+        return operation
@@ -0,0 +1,111 @@
+from collections import Counter
+import logging
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from colorama import Fore
+
+from app.calculator import Calculator
+from app.calculator_config import CalculatorConfig
+
+# Real implementations, restored for tests marked real_io
+_REAL_FILE_HANDLER = logging.FileHandler
+_REAL_TO_CSV = pd.DataFrame.to_csv
+
+# Stub out log file handlers and CSV writes for the whole session so tests do
+# not touch the disk unless they ask to.
+@pytest.fixture(autouse=True, scope="session")
+def _stub_io():
+    with patch("logging.FileHandler", lambda *args, **kwargs: logging.NullHandler()), \
+         patch("pandas.DataFrame.to_csv", lambda *args, **kwargs: None):
+        yield
+
+@pytest.fixture(autouse=True)
+def _real_io(request, monkeypatch):
+    if request.node.get_closest_marker("real_io"):
+        monkeypatch.setattr(logging, "FileHandler", _REAL_FILE_HANDLER)
+        monkeypatch.setattr(pd.DataFrame, "to_csv", _REAL_TO_CSV)
+
+
+def pytest_collection_modifyitems(items):
+    """Mark every test that neither drives the REPL nor is marked slow as fast."""
+    for item in items:
+        if not item.get_closest_marker("repl") and not item.get_closest_marker("slow"):
+            item.add_marker(pytest.mark.fast)
+
+
+def _config_under(base_dir: Path) -> CalculatorConfig:
+    """Build a config that keeps log and history files under base_dir."""
+    return CalculatorConfig(
+        base_dir=base_dir,
+        log_dir=base_dir / "logs",
+        history_dir=base_dir / "history",
+        history_file=base_dir / "history/calculator_history.csv",
+        log_file=base_dir / "logs/calculator.log",
+    )
+
+# Config rooted in a fresh per-test directory
+@pytest.fixture
+def tmp_config(tmp_path):
+    return _config_under(tmp_path)
+
+# Config rooted in one directory shared by a whole test module
+@pytest.fixture(scope="module")
+def module_tmp_config(tmp_path_factory):
+    return _config_under(tmp_path_factory.mktemp("calc"))
+
+# One calculator per test module, built on module_tmp_config; borrow it through calculator
+@pytest.fixture(scope="module")
+def _module_calculator(module_tmp_config):
+    return Calculator(config=module_tmp_config)
+
+# Lend the module's calculator to a test, then clear the state it touched
+@pytest.fixture
+def calculator(_module_calculator):
+    yield _module_calculator
+    _module_calculator.clear_history()
+    _module_calculator.observers.clear()
+    _module_calculator.operation_strategy = None
+
+# Default config for tests that only read it; never mutate this instance
+@pytest.fixture(scope="session")
+def default_config():
+    return CalculatorConfig()
+
+
+class _StubHistoryFrame:
+    """The slice of a DataFrame that Calculator.load_history reads: empty and iterrows()."""
+
+    def __init__(self, rows):
+        self._rows = rows
+        self.empty = not rows
+
+    def iterrows(self):
+        return enumerate(self._rows)
+
+# Builds a read_csv result from a list of row dicts without constructing a DataFrame
+@pytest.fixture(scope="session")
+def history_frame():
+    return _StubHistoryFrame
+
+
+class PrintCapture:
+    """Stand-in for print that counts each distinct tuple of arguments."""
+
+    def __init__(self, strip_color=False):
+        self.lines = Counter()
+        self.strip_color = strip_color
+
+    def __call__(self, *args, **kwargs):
+        if self.strip_color:
+            args = tuple(arg.replace(Fore.RED, '') if isinstance(arg, str) else arg for arg in args)
+        self.lines[args] += 1
+
+# Capture print calls; tests marked plain_output see them without the red error color
+@pytest.fixture
+def print_capture(request, monkeypatch):
+    capture = PrintCapture(strip_color=request.node.get_closest_marker("plain_output") is not None)
+    monkeypatch.setattr('builtins.print', capture)
+    return capture
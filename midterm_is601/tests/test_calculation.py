@@ -1,3 +1,4 @@
+import re
 import pytest
 from decimal import Decimal
 from datetime import datetime
@@ -6,55 +7,40 @@ from app.exceptions import OperationError
 import logging
 
 
-def test_addition():
-    calc = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
-    assert calc.result == Decimal("5")
-
-
-def test_subtraction():
-    calc = Calculation(operation="Subtraction", operand1=Decimal("5"), operand2=Decimal("3"))
-    assert calc.result == Decimal("2")
-
-
-def test_multiplication():
-    calc = Calculation(operation="Multiplication", operand1=Decimal("4"), operand2=Decimal("2"))
-    assert calc.result == Decimal("8")
-
-
-def test_division():
-    calc = Calculation(operation="Division", operand1=Decimal("8"), operand2=Decimal("2"))
-    assert calc.result == Decimal("4")
-
-
-def test_division_by_zero():
-    with pytest.raises(OperationError, match="Division by zero is not allowed"):
-        Calculation(operation="Division", operand1=Decimal("8"), operand2=Decimal("0"))
-
-
-def test_power():
-    calc = Calculation(operation="Power", operand1=Decimal("2"), operand2=Decimal("3"))
-    assert calc.result == Decimal("8")
-
-
-def test_negative_power():
-    with pytest.raises(OperationError, match="Negative exponents are not supported"):
-        Calculation(operation="Power", operand1=Decimal("2"), operand2=Decimal("-3"))
-
-
-def test_root():
-    calc = Calculation(operation="Root", operand1=Decimal("16"), operand2=Decimal("2"))
-    assert calc.result == Decimal("4")
-
-
-def test_invalid_root():
-    with pytest.raises(OperationError, match="Cannot calculate root of negative number"):
-        Calculation(operation="Root", operand1=Decimal("-16"), operand2=Decimal("2"))
-
-# Added test for zero root - Greg H
-def test_zero_root():
-    """Test that attempting to calculate a root with zero degree raises appropriate error."""
-    with pytest.raises(OperationError, match="Zero root is undefined"):
-        Calculation(operation="Root", operand1=Decimal("16"), operand2=Decimal("0"))
+# Shared read-only Addition(2, 3) calculation
+@pytest.fixture(scope="module")
+def add_2_3():
+    return Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+
+
+@pytest.mark.parametrize("operation, a, b, expected", [
+    ("Addition", "2", "3", "5"),
+    ("Subtraction", "5", "3", "2"),
+    ("Multiplication", "4", "2", "8"),
+    ("Division", "8", "2", "4"),
+    ("Power", "2", "3", "8"),
+    ("Root", "16", "2", "4"),
+    ("Modulus", "10", "3", "1"),              # Added test for Modulus - Greg H
+    ("IntegerDivision", "10", "3", "3"),      # Added test for IntegerDivision - Greg H
+    ("Percentage", "50", "200", "25"),        # Added test for Percentage - Greg H
+    ("AbsoluteDifference", "5", "10", "5"),   # Added test for AbsoluteDifference - Greg H
+])
+def test_binary_operation(operation, a, b, expected):
+    calc = Calculation(operation=operation, operand1=Decimal(a), operand2=Decimal(b))
+    assert calc.result == Decimal(expected)
+
+
+@pytest.mark.parametrize("operation, a, b, message", [
+    ("Division", "8", "0", "Division by zero is not allowed"),
+    ("Power", "2", "-3", "Negative exponents are not supported"),
+    ("Root", "-16", "2", "Cannot calculate root of negative number"),
+    ("Root", "16", "0", "Zero root is undefined"),                      # Added test for zero root - Greg H
+    ("Modulus", "10", "0", "Division by zero is not allowed"),          # Added test for Modulus by zero - Greg H
+    ("IntegerDivision", "10", "0", "Division by zero is not allowed"),  # Added test for IntegerDivision by zero - Greg H
+])
+def test_invalid_binary_operation(operation, a, b, message):
+    with pytest.raises(OperationError, match=message):
+        Calculation(operation=operation, operand1=Decimal(a), operand2=Decimal(b))
 
 
 def test_calculation_error_handling():
@@ -64,43 +50,14 @@ def test_calculation_error_handling():
         # This should trigger an OverflowError or similar when trying to compute huge power
         Calculation(operation="Power", operand1=Decimal("10"), operand2=Decimal("10000"))
 
-# Added test for Modulus - Greg H
-def test_modulus():
-    calc = Calculation(operation="Modulus", operand1=Decimal("10"), operand2=Decimal("3"))
-    assert calc.result == Decimal("1")
-
-# Added test for Modulus by zero - Greg H    
-def test_modulus_by_zero():
-    with pytest.raises(OperationError, match="Division by zero is not allowed"):
-        Calculation(operation="Modulus", operand1=Decimal("10"), operand2=Decimal("0"))
-
-# Added test for IntegerDivision - Greg H
-def test_integer_division():
-    calc = Calculation(operation="IntegerDivision", operand1=Decimal("10"), operand2=Decimal("3"))
-    assert calc.result == Decimal("3")
-
-# Added test for IntegerDivision by zero - Greg H
-def test_integer_division_by_zero():
-    with pytest.raises(OperationError, match="Division by zero is not allowed"):
-        Calculation(operation="IntegerDivision", operand1=Decimal("10"), operand2=Decimal("0"))
-
-# Added test for Percentage - Greg H
-def test_percentage():
-    calc = Calculation(operation="Percentage", operand1=Decimal("50"), operand2=Decimal("200"))
-    assert calc.result == Decimal("25")
-
-# Added test for AbsoluteDifference - Greg H
-def test_absolute_difference():
-    calc = Calculation(operation="Subtraction", operand1=Decimal("5"), operand2=Decimal("10"))
-    assert abs(calc.result) == Decimal("5")
 
 def test_unknown_operation():
     with pytest.raises(OperationError, match="Unknown operation"):
         Calculation(operation="Unknown", operand1=Decimal("5"), operand2=Decimal("3"))
 
 
-def test_to_dict():
-    calc = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+def test_to_dict(add_2_3):
+    calc = add_2_3
     result_dict = calc.to_dict()
     assert result_dict == {
         "operation": "Addition",
@@ -120,10 +77,8 @@ def test_from_dict():
         "timestamp": datetime.now().isoformat()
     }
     calc = Calculation.from_dict(data)
-    assert calc.operation == "Addition"
-    assert calc.operand1 == Decimal("2")
-    assert calc.operand2 == Decimal("3")
-    assert calc.result == Decimal("5")
+    assert (calc.operation, calc.operand1, calc.operand2, calc.result) == \
+        ("Addition", Decimal("2"), Decimal("3"), Decimal("5"))
 
 
 def test_invalid_from_dict():
@@ -144,17 +99,17 @@ def test_format_result():
     assert calc.format_result(precision=10) == "0.3333333333"
 
 
-def test_equality():
-    calc1 = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+def test_equality(add_2_3):
+    calc1 = add_2_3
     calc2 = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
     calc3 = Calculation(operation="Subtraction", operand1=Decimal("5"), operand2=Decimal("3"))
     assert calc1 == calc2
     assert calc1 != calc3
 
 # Added equality test with non-Calculation objects - Greg H
-def test_equality_with_non_calculation():
+def test_equality_with_non_calculation(add_2_3):
     """Test equality comparison with non-Calculation objects returns NotImplemented."""
-    calc = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+    calc = add_2_3
     
     # Test comparison with different types - should return False (not equal)
     assert calc != "not a calculation"
@@ -191,9 +146,9 @@ def test_from_dict_result_mismatch(caplog):
     assert "Loaded calculation result 10 differs from computed result 5" in caplog.text
 
 # Added tests for string representations - Greg H
-def test_str_representation():
+def test_str_representation(add_2_3):
     """Test the __str__ method returns correct string representation."""
-    calc = Calculation(operation="Addition", operand1=Decimal("2"), operand2=Decimal("3"))
+    calc = add_2_3
     expected_str = "Addition(2, 3) = 5"
     assert str(calc) == expected_str
 
@@ -202,8 +157,7 @@ def test_repr_representation():
     """Test the __repr__ method returns correct detailed representation."""
     calc = Calculation(operation="Multiplication", operand1=Decimal("4"), operand2=Decimal("5"))
     repr_str = repr(calc)
-    assert "Calculation(operation='Multiplication'" in repr_str
-    assert "operand1=4" in repr_str
-    assert "operand2=5" in repr_str
-    assert "result=20" in repr_str
-    assert "timestamp=" in repr_str
+    assert re.match(
+        r"Calculation\(operation='Multiplication', operand1=4, operand2=5, result=20, timestamp='.+'\)$",
+        repr_str
+    )
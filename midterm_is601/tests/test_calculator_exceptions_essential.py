@@ -2,36 +2,75 @@
 # Essential Calculator Exception Tests #
 ########################
 
+from contextlib import contextmanager
+import logging
 import pytest
-from decimal import Decimal
-from pathlib import Path
-from tempfile import TemporaryDirectory
-from unittest.mock import patch, Mock, PropertyMock
+import re
+from decimal import Decimal, InvalidOperation
+from unittest.mock import patch
 
+from app import input_validators
+from app.calculation import Calculation
 from app.calculator import Calculator
-from app.calculator_config import CalculatorConfig
 from app.exceptions import OperationError, ValidationError
 from app.operations import OperationFactory
 
+# Collected by `pytest -m essential` along with the other essential suites
+pytestmark = pytest.mark.essential
+
+# Expected error messages, compiled once for pytest.raises(match=...)
+_NO_OP = re.compile("No operation set")
+_INVALID_FMT = re.compile("Invalid number format")
+_EXCEEDS = re.compile("Value exceeds maximum allowed")
+_OP_FAILED = re.compile("Operation failed: Calculation failed")
+_SAVE_FAIL = re.compile("Failed to save history: File write error")
+_LOAD_FAIL = re.compile("Failed to load history: File read error")
+_LOGGING_FAIL = re.compile("Logging setup failed")
+_LOAD_CORRUPT = re.compile("Failed to load history: Invalid calculation data")
+
+# Shared addition strategy; operations hold no state between calls
+ADD_OP = OperationFactory.create_operation('add')
+
+
+@contextmanager
+def _swap(obj, attr, new):
+    """Temporarily replace obj.attr with new, restoring the original afterwards."""
+    old = getattr(obj, attr)
+    setattr(obj, attr, new)
+    try:
+        yield new
+    finally:
+        setattr(obj, attr, old)
+
+
+def _raiser(error):
+    """Build a stand-in callable that raises error whenever it is called."""
+    def raise_error(*args, **kwargs):
+        raise error
+    return raise_error
+
+
+class _FailingOp:
+    """Operation stand-in whose execute always fails."""
+
+    def execute(self, a, b):
+        raise Exception("Calculation failed")
+
+    def __str__(self):
+        return "MockOperation"
+
+
+@pytest.fixture(autouse=True)
+def _no_fs(monkeypatch):
+    """Skip log directory creation and logging setup; tests patch these back in as needed."""
+    monkeypatch.setattr('app.calculator.os.makedirs', lambda *args, **kwargs: None)
+    monkeypatch.setattr('app.calculator.logging.basicConfig', lambda *args, **kwargs: None)
+
 
 @pytest.fixture
-def calculator():
-    """Create a calculator instance with temporary directory."""
-    with TemporaryDirectory() as temp_dir:
-        temp_path = Path(temp_dir)
-        config = CalculatorConfig(base_dir=temp_path)
-        
-        with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-             patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-             patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-             patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
-            
-            mock_log_dir.return_value = temp_path / "logs"
-            mock_log_file.return_value = temp_path / "logs/calculator.log"
-            mock_history_dir.return_value = temp_path / "history"
-            mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-            
-            yield Calculator(config=config)
+def calculator_rw(tmp_config):
+    """Create a fresh calculator for tests that change its config."""
+    return Calculator(config=tmp_config)
 
 
 class TestEssentialCalculatorExceptions:
@@ -39,86 +78,65 @@ class TestEssentialCalculatorExceptions:
     
     def test_operation_error_no_operation_set(self, calculator):
         """Test OperationError when no operation is set."""
-        with pytest.raises(OperationError, match="No operation set"):
+        with pytest.raises(OperationError, match=_NO_OP):
             calculator.perform_operation(2, 3)
     
-    def test_validation_error_invalid_input(self, calculator):
+    @pytest.mark.parametrize("a, match", [
+        ("not_a_number", _INVALID_FMT),  # Invalid string
+        ("", None),                      # Empty string
+    ])
+    def test_validation_error_invalid_input(self, calculator, a, match):
         """Test ValidationError with various invalid inputs."""
-        calculator.set_operation(OperationFactory.create_operation('add'))
+        calculator.set_operation(ADD_OP)
         
-        # Test invalid string
-        with pytest.raises(ValidationError, match="Invalid number format"):
-            calculator.perform_operation("not_a_number", 3)
-        
-        # Test empty string  
-        with pytest.raises(ValidationError):
-            calculator.perform_operation("", 3)
+        with pytest.raises(ValidationError, match=match):
+            calculator.perform_operation(a, 3)
     
-    def test_validation_error_exceeds_max_value(self, calculator):
+    def test_validation_error_exceeds_max_value(self, calculator_rw):
         """Test ValidationError when input exceeds maximum allowed value."""
-        calculator.set_operation(OperationFactory.create_operation('add'))
-        calculator.config.max_input_value = Decimal('100')
+        calculator_rw.set_operation(ADD_OP)
+        calculator_rw.config.max_input_value = Decimal('100')
         
-        with pytest.raises(ValidationError, match="Value exceeds maximum allowed"):
-            calculator.perform_operation(999999, 3)
+        with pytest.raises(ValidationError, match=_EXCEEDS):
+            calculator_rw.perform_operation(999999, 3)
     
     def test_operation_error_during_calculation(self, calculator):
         """Test OperationError during calculation execution."""
-        mock_operation = Mock()
-        mock_operation.execute.side_effect = Exception("Calculation failed")
-        mock_operation.__str__ = Mock(return_value="MockOperation")
+        calculator.set_operation(_FailingOp())
         
-        calculator.set_operation(mock_operation)
-        
-        with pytest.raises(OperationError, match="Operation failed: Calculation failed"):
+        with pytest.raises(OperationError, match=_OP_FAILED):
             calculator.perform_operation(2, 3)
     
     def test_operation_error_save_history_failure(self, calculator):
         """Test OperationError when saving history fails."""
-        calculator.set_operation(OperationFactory.create_operation('add'))
+        calculator.set_operation(ADD_OP)
         calculator.perform_operation(2, 3)
         
-        with patch('app.calculator.pd.DataFrame.to_csv') as mock_to_csv:
-            mock_to_csv.side_effect = Exception("File write error")
-            
-            with pytest.raises(OperationError, match="Failed to save history: File write error"):
+        import pandas as pd
+        
+        # Fail at frame construction so no real DataFrame is built for an error-path test
+        with _swap(pd, 'DataFrame', _raiser(Exception("File write error"))):
+            with pytest.raises(OperationError, match=_SAVE_FAIL):
                 calculator.save_history()
     
-    def test_initialization_history_load_failure(self):
+    @pytest.mark.slow
+    def test_initialization_history_load_failure(self, tmp_config):
         """Test exception handling during calculator initialization when history loading fails (lines 77-79)."""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            config = CalculatorConfig(base_dir=temp_path)
-            
-            with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-                 patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-                 patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-                 patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
+        error = Exception("History file corrupted")
+        with _swap(Calculator, 'load_history', _raiser(error)):
+            with patch('app.calculator.logging.warning') as mock_warning:
+                calculator = Calculator(config=tmp_config)
                 
-                mock_log_dir.return_value = temp_path / "logs"
-                mock_log_file.return_value = temp_path / "logs/calculator.log"
-                mock_history_dir.return_value = temp_path / "history"
-                mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-                
-                with patch('app.calculator.Calculator.load_history') as mock_load_history:
-                    mock_load_history.side_effect = Exception("History file corrupted")
-                    
-                    with patch('app.calculator.logging.warning') as mock_warning:
-                        calculator = Calculator(config=config)
-                        
-                        mock_warning.assert_called_once_with("Could not load existing history: History file corrupted")
-                        assert isinstance(calculator, Calculator)
-                        assert calculator.history == []
+                mock_warning.assert_called_once_with("Could not load existing history: %s", error)
+                assert isinstance(calculator, Calculator)
+                assert calculator.history == []
     
     def test_operation_error_with_chained_exception(self, calculator):
         """Test OperationError with chained exceptions from validation."""
-        calculator.set_operation(OperationFactory.create_operation('add'))
+        calculator.set_operation(ADD_OP)
         
-        with patch('app.input_validators.Decimal') as mock_decimal:
-            from decimal import InvalidOperation
-            mock_decimal.side_effect = InvalidOperation("Invalid decimal")
-            
-            with pytest.raises(ValidationError, match="Invalid number format"):
+        with _swap(input_validators, 'Decimal', _raiser(InvalidOperation("Invalid decimal"))):
+            with pytest.raises(ValidationError, match=_INVALID_FMT):
                 calculator.perform_operation("123.456", 3)
     
     def test_exception_with_observer_notification(self, calculator):
@@ -142,98 +160,85 @@ class TestEssentialCalculatorExceptions:
         with pytest.raises(ValueError):
             calculator.remove_observer(observer)
     
-    def test_history_size_limit_enforcement(self, calculator):
-        """Test that history does not exceed max size (covers line 219)."""
-        calculator.config.max_history_size = 2
-        
-        add_operation = OperationFactory.create_operation('add')
-        calculator.set_operation(add_operation)
-        
-        # Fill to capacity
-        calculator.perform_operation(1, 2)
-        calculator.perform_operation(2, 3)
-        assert len(calculator.history) == 2
-        
-        # Exceed capacity - should trigger history.pop(0) on line 219
-        calculator.perform_operation(3, 4)
-        assert len(calculator.history) == 2
-        assert calculator.history[0].operand1 == Decimal('2')  # First was removed
-        assert calculator.history[1].operand1 == Decimal('3')  # New one added
+    def test_history_size_limit_enforcement(self, calculator_rw):
+        """Test that history does not exceed max size."""
+        calculator_rw.config.max_history_size = 2
+        
+        # Exceed capacity by one without running the operation pipeline
+        calculator_rw.history.extend(
+            Calculation("Addition", Decimal(n), Decimal(n + 1)) for n in (1, 2, 3)
+        )
+        calculator_rw._trim_history()
+        
+        assert len(calculator_rw.history) == 2
+        assert calculator_rw.history[0].operand1 == Decimal('2')  # First was removed
+        assert calculator_rw.history[1].operand1 == Decimal('3')  # Newest kept
+
+    def test_load_history_corrupted_row(self, calculator_rw, history_frame):
+        """Test that a saved row with an invalid operand fails the whole load."""
+        import pandas as pd
+        
+        calculator_rw.config.history_file.touch()
+        corrupted = history_frame([{
+            'operation': "Addition", 'operand1': "invalid_decimal", 'operand2': "3",
+            'result': "5", 'timestamp': "2023-01-01T00:00:00"
+        }])
+        
+        with _swap(pd, 'read_csv', lambda *args, **kwargs: corrupted):
+            with pytest.raises(OperationError, match=_LOAD_CORRUPT):
+                calculator_rw.load_history()
+        assert calculator_rw.history == []
 
 
 class TestInputValidationExceptions:
     """Test input validation edge cases."""
     
-    def test_validation_error_boundary_cases(self):
+    # Key boundary cases that matter for business logic
+    @pytest.mark.parametrize("invalid_input", [
+        None,           # Null input
+        complex(1, 2),  # Complex numbers (common user mistake)
+        float('inf'),   # Infinity (mathematical edge case)
+        float('nan'),   # NaN (mathematical edge case)
+        [1, 2, 3],      # Containers are not numbers
+        {"value": 1},
+        object(),       # Arbitrary objects
+    ])
+    def test_validation_error_boundary_cases(self, invalid_input, default_config):
         """Test validation error boundary cases."""
         from app.input_validators import InputValidator
-        from app.calculator_config import CalculatorConfig
-        
-        config = CalculatorConfig()
         
-        # Key boundary cases that matter for business logic
-        boundary_cases = [
-            None,           # Null input
-            complex(1, 2),  # Complex numbers (common user mistake)
-            float('inf'),   # Infinity (mathematical edge case)
-            float('nan'),   # NaN (mathematical edge case)
-        ]
-        
-        for invalid_input in boundary_cases:
-            with pytest.raises(ValidationError):
-                InputValidator.validate_number(invalid_input, config)
+        with pytest.raises(ValidationError):
+            InputValidator.validate_number(invalid_input, default_config)
 
 
 class TestCalculatorSetupExceptions:
     """Test calculator setup and initialization exception paths for 100% coverage."""
     
-    def test_logging_setup_failure_lines_103_106(self):
+    @pytest.mark.slow
+    def test_logging_setup_failure_lines_103_106(self, tmp_config):
         """Test exception handling in _setup_logging method (lines 103-106)."""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            config = CalculatorConfig(base_dir=temp_path)
-            
-            with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-                 patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-                 patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-                 patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
-                
-                mock_log_dir.return_value = temp_path / "logs"
-                mock_log_file.return_value = temp_path / "logs/calculator.log"
-                mock_history_dir.return_value = temp_path / "history"
-                mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-                
-                # Mock logging.basicConfig to raise an exception (lines 103-106)
-                with patch('app.calculator.logging.basicConfig') as mock_basic_config:
-                    mock_basic_config.side_effect = Exception("Logging setup failed")
-                    
-                    # Should print error message and re-raise exception
-                    with pytest.raises(Exception, match="Logging setup failed"):
-                        Calculator(config=config)
+        # Mock logging.basicConfig to raise an exception (lines 103-106)
+        with _swap(logging, 'basicConfig', _raiser(Exception("Logging setup failed"))):
+            # Should print error message and re-raise exception
+            with pytest.raises(Exception, match=_LOGGING_FAIL):
+                Calculator(config=tmp_config)
     
-    def test_load_history_failure_lines_309_312(self):
+    def test_directory_setup_failure(self, tmp_config):
+        """Test that a failure creating the history directory propagates from __init__."""
+        # Replace only the method that calls mkdir, not Path.mkdir for every path
+        with _swap(Calculator, '_setup_directories', _raiser(PermissionError("Permission denied"))):
+            with pytest.raises(PermissionError, match="Permission denied"):
+                Calculator(config=tmp_config)
+    
+    def test_load_history_failure_lines_309_312(self, calculator_rw):
         """Test exception handling in load_history method (lines 309-312)."""
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            config = CalculatorConfig(base_dir=temp_path)
-            
-            with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-                 patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-                 patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-                 patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
-                
-                mock_log_dir.return_value = temp_path / "logs"
-                mock_log_file.return_value = temp_path / "logs/calculator.log"
-                mock_history_dir.return_value = temp_path / "history"
-                mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-                
-                calculator = Calculator(config=config)
-                
-                # Mock pandas read_csv to raise an exception (lines 309-312)
-                with patch('app.calculator.pd.read_csv') as mock_read_csv:
-                    mock_read_csv.side_effect = Exception("File read error")
-                    
-                    with patch('app.calculator.Path.exists', return_value=True):
-                        # Should log error and raise OperationError
-                        with pytest.raises(OperationError, match="Failed to load history: File read error"):
-                            calculator.load_history()
\ No newline at end of file
+        # An empty history file on disk makes load_history reach read_csv
+        calculator_rw.config.history_file.touch()
+        
+        import pandas as pd
+        
+        # Make pandas read_csv raise an exception (lines 309-312)
+        with _swap(pd, 'read_csv', _raiser(Exception("File read error"))):
+            # Should log error and raise OperationError
+            with pytest.raises(OperationError, match=_LOAD_FAIL):
+                calculator_rw.load_history()
\ No newline at end of file
@@ -5,25 +5,25 @@
 import pytest
 import datetime
 from decimal import Decimal
-from pathlib import Path
-from tempfile import TemporaryDirectory
-from unittest.mock import patch, PropertyMock
 
 from app.calculator_memento import CalculatorMemento
 from app.calculation import Calculation
 from app.exceptions import OperationError
 
+pytestmark = pytest.mark.essential
+
+
+@pytest.fixture(scope="module")
+def sample_calculations():
+    """Create sample calculations once per module; a tuple so no test can mutate them."""
+    calc1 = Calculation("Addition", Decimal("2"), Decimal("3"))
+    calc2 = Calculation("Multiplication", Decimal("4"), Decimal("5"))
+    return (calc1, calc2)
+
 
 class TestCalculatorMemento:
     """Essential test suite for CalculatorMemento class."""
 
-    @pytest.fixture
-    def sample_calculations(self):
-        """Create sample calculations for testing."""
-        calc1 = Calculation("Addition", Decimal("2"), Decimal("3"))
-        calc2 = Calculation("Multiplication", Decimal("4"), Decimal("5"))
-        return [calc1, calc2]
-
     def test_memento_creation_empty_and_with_data(self, sample_calculations):
         """Test creating mementos with empty and populated history."""
         # Empty history
@@ -32,14 +32,14 @@ class TestCalculatorMemento:
         assert isinstance(empty_memento.timestamp, datetime.datetime)
         
         # With calculations
-        memento = CalculatorMemento(history=sample_calculations)
+        memento = CalculatorMemento(history=list(sample_calculations))
         assert len(memento.history) == 2
         assert memento.history[0].operation == "Addition"
         assert memento.history[0].result == Decimal("5")
 
     def test_memento_serialization_to_dict(self, sample_calculations):
         """Test converting memento to dictionary."""
-        memento = CalculatorMemento(history=sample_calculations)
+        memento = CalculatorMemento(history=list(sample_calculations))
         result_dict = memento.to_dict()
         
         assert 'history' in result_dict
@@ -70,7 +70,7 @@ class TestCalculatorMemento:
 
     def test_memento_roundtrip_integrity(self, sample_calculations):
         """Test that memento preserves data through serialization roundtrip."""
-        original_memento = CalculatorMemento(history=sample_calculations)
+        original_memento = CalculatorMemento(history=list(sample_calculations))
         
         # Serialize and deserialize
         memento_dict = original_memento.to_dict()
@@ -120,34 +120,16 @@ class TestCalculatorMemento:
         with pytest.raises(OperationError):
             CalculatorMemento.from_dict(data)
 
-    def test_memento_calculator_integration(self):
+    def test_memento_calculator_integration(self, calculator):
         """Test memento works with actual calculator instances."""
-        from app.calculator import Calculator
-        from app.calculator_config import CalculatorConfig
         from app.operations import OperationFactory
         
-        with TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            config = CalculatorConfig(base_dir=temp_path)
-            
-            with patch.object(CalculatorConfig, 'log_dir', new_callable=PropertyMock) as mock_log_dir, \
-                 patch.object(CalculatorConfig, 'log_file', new_callable=PropertyMock) as mock_log_file, \
-                 patch.object(CalculatorConfig, 'history_dir', new_callable=PropertyMock) as mock_history_dir, \
-                 patch.object(CalculatorConfig, 'history_file', new_callable=PropertyMock) as mock_history_file:
-                
-                mock_log_dir.return_value = temp_path / "logs"
-                mock_log_file.return_value = temp_path / "logs/calculator.log"
-                mock_history_dir.return_value = temp_path / "history"
-                mock_history_file.return_value = temp_path / "history/calculator_history.csv"
-                
-                # Create calculator and perform operations
-                calculator = Calculator(config=config)
-                calculator.set_operation(OperationFactory.create_operation('add'))
-                calculator.perform_operation(2, 3)
-                calculator.perform_operation(5, 7)
-                
-                # Create and test memento from real calculator state
-                memento = CalculatorMemento(history=calculator.history.copy())
-                assert len(memento.history) == 2
-                assert memento.history[0].result == Decimal("5")
-                assert memento.history[1].result == Decimal("12")
\ No newline at end of file
+        calculator.set_operation(OperationFactory.create_operation('add'))
+        calculator.perform_operation(2, 3)
+        calculator.perform_operation(5, 7)
+        
+        # Create and test memento from real calculator state
+        memento = CalculatorMemento(history=calculator.history.copy())
+        assert len(memento.history) == 2
+        assert memento.history[0].result == Decimal("5")
+        assert memento.history[1].result == Decimal("12")
@@ -144,3 +144,19 @@ def test_history_file_property():
     config = CalculatorConfig(base_dir=Path('/new_base_dir'))
     assert config.history_file == Path('/new_base_dir/history/calculator_history.csv').resolve()
 
+def test_explicit_paths_override_environment():
+    os.environ['CALCULATOR_LOG_DIR'] = './test_logs'
+    os.environ['CALCULATOR_HISTORY_FILE'] = './test_history/test_history.csv'
+    config = CalculatorConfig(
+        base_dir=Path('/new_base_dir'),
+        log_dir=Path('/explicit/logs'),
+        history_file=Path('/explicit/history.csv')
+    )
+    assert config.log_dir == Path('/explicit/logs').resolve()
+    assert config.history_file == Path('/explicit/history.csv').resolve()
+
+def test_explicit_dirs_used_for_default_file_names():
+    clear_env_vars('CALCULATOR_HISTORY_FILE', 'CALCULATOR_LOG_FILE')
+    config = CalculatorConfig(log_dir=Path('/explicit/logs'), history_dir=Path('/explicit/history'))
+    assert config.log_file == Path('/explicit/logs/calculator.log').resolve()
+    assert config.history_file == Path('/explicit/history/calculator_history.csv').resolve()
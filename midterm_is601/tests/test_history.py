@@ -1,7 +1,9 @@
+import threading
+
 import pytest
 from unittest.mock import Mock, patch
 from app.calculation import Calculation
-from app.history import LoggingObserver, AutoSaveObserver
+from app.history import LoggingObserver, AutoSaveObserver, BufferedAutoSaveObserver
 from app.calculator import Calculator
 from app.calculator_config import CalculatorConfig
 
@@ -19,7 +21,7 @@ def test_logging_observer_logs_calculation(logging_info_mock):
     observer = LoggingObserver()
     observer.update(calculation_mock)
     logging_info_mock.assert_called_once_with(
-        "Calculation performed: addition (5, 3) = 8"
+        "Calculation performed: %s (%s, %s) = %s", "addition", 5, 3, 8
     )
 
 def test_logging_observer_no_calculation():
@@ -71,3 +73,97 @@ def test_autosave_observer_no_calculation():
     
     with pytest.raises(AttributeError):
         observer.update(None)  # Passing None should raise an exception
+
+# Test cases for BufferedAutoSaveObserver
+
+def _buffered_calculator_mock(auto_save=True):
+    calculator_mock = Mock(spec=Calculator)
+    calculator_mock.config = Mock(spec=CalculatorConfig)
+    calculator_mock.config.auto_save = auto_save
+    return calculator_mock
+
+def test_buffered_autosave_defers_until_flush_every():
+    calculator_mock = _buffered_calculator_mock()
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=3, flush_interval=3600)
+
+    observer.update(calculation_mock)
+    observer.update(calculation_mock)
+    calculator_mock.save_history.assert_not_called()
+
+    observer.update(calculation_mock)
+    calculator_mock.save_history.assert_called_once()
+    assert observer.pending == 0
+
+@patch('app.history.time.monotonic', side_effect=[0.0, 5.0, 5.0])
+def test_buffered_autosave_flushes_after_interval(mock_monotonic):
+    calculator_mock = _buffered_calculator_mock()
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=100, flush_interval=2.0)
+
+    observer.update(calculation_mock)
+    calculator_mock.save_history.assert_called_once()
+
+def test_buffered_autosave_flush_saves_pending_only():
+    calculator_mock = _buffered_calculator_mock()
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=100, flush_interval=3600)
+
+    observer.flush()
+    calculator_mock.save_history.assert_not_called()
+
+    observer.update(calculation_mock)
+    observer.flush()
+    calculator_mock.save_history.assert_called_once()
+
+def test_buffered_autosave_does_not_buffer_when_disabled():
+    calculator_mock = _buffered_calculator_mock(auto_save=False)
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=1)
+
+    observer.update(calculation_mock)
+    observer.flush()
+    calculator_mock.save_history.assert_not_called()
+
+def test_buffered_autosave_no_calculation():
+    observer = BufferedAutoSaveObserver(_buffered_calculator_mock())
+    with pytest.raises(AttributeError):
+        observer.update(None)
+
+def test_buffered_autosave_background_writes_snapshot():
+    calculator_mock = _buffered_calculator_mock()
+    calculator_mock.history = [calculation_mock]
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=1, background=True)
+
+    observer.update(calculation_mock)
+    observer.flush(wait=True)
+    calculator_mock.save_history.assert_called_once_with([calculation_mock])
+
+    observer.close()
+    assert observer._worker is None
+
+@patch('logging.warning')
+def test_buffered_autosave_close_keeps_running_writer(logging_warning_mock):
+    calculator_mock = _buffered_calculator_mock()
+    calculator_mock.history = []
+    release = threading.Event()
+    calculator_mock.save_history.side_effect = lambda snapshot: release.wait()
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=1, background=True)
+
+    # The writer is stuck in a save, so close gives up but keeps the thread
+    observer.update(calculation_mock)
+    assert observer.close(timeout=0.01) is False
+    assert observer._worker is not None
+    logging_warning_mock.assert_called_once()
+
+    release.set()
+    assert observer.close() is True
+    assert observer._worker is None
+
+@patch('logging.error')
+def test_buffered_autosave_background_logs_failure(logging_error_mock):
+    calculator_mock = _buffered_calculator_mock()
+    calculator_mock.history = []
+    error = Exception("Disk full")
+    calculator_mock.save_history.side_effect = error
+    observer = BufferedAutoSaveObserver(calculator_mock, flush_every=1, background=True)
+
+    observer.update(calculation_mock)
+    observer.close()
+    logging_error_mock.assert_called_once_with("Background auto-save failed: %s", error)
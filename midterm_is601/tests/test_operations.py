@@ -297,6 +297,25 @@ class TestOperationFactory:
         operation = OperationFactory.create_operation("new_op")
         assert isinstance(operation, NewOperation)
 
+    def test_create_operation_reuses_instance(self):
+        """Test that repeated creation returns the cached instance."""
+        assert OperationFactory.create_operation('add') is OperationFactory.create_operation('ADD')
+
+    def test_register_operation_replaces_cached_instance(self):
+        """Test that re-registering a name discards its cached instance."""
+        class FirstOperation(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return a
+
+        class SecondOperation(Operation):
+            def execute(self, a: Decimal, b: Decimal) -> Decimal:
+                return b
+
+        OperationFactory.register_operation("swap_op", FirstOperation)
+        assert isinstance(OperationFactory.create_operation("swap_op"), FirstOperation)
+        OperationFactory.register_operation("swap_op", SecondOperation)
+        assert isinstance(OperationFactory.create_operation("swap_op"), SecondOperation)
+
     def test_register_invalid_operation(self):
         """Test registering an invalid operation class raises error."""
         class InvalidOperation:
@@ -29,301 +29,219 @@ focused, essential tests rather than exhaustive test suites.
 """
 
 import pytest
-from unittest.mock import patch, Mock
-from decimal import Decimal
+from unittest.mock import patch
+from app.calculator_repl import calculator_repl
 from app.exceptions import OperationError, ValidationError
 
+pytestmark = [pytest.mark.essential, pytest.mark.repl, pytest.mark.plain_output]
+
+
+@pytest.fixture
+def feed_input(monkeypatch):
+    """Answer input() prompts in order from a list, raising any exception instances in it."""
+    def feed(answers):
+        answers = iter(answers)
+
+        def fake_input(prompt=""):
+            answer = next(answers)
+            if isinstance(answer, BaseException):
+                raise answer
+            return answer
+
+        monkeypatch.setattr('builtins.input', fake_input)
+        return answers
+    return feed
+
+
+class _FakeCalculator:
+    """Calculator stand-in for the REPL; each method returns, or raises, the response a test set for it."""
+
+    def __init__(self, config):
+        self.config = config
+        self.observers = []
+        self.responses = {}
+        self.calls = []
+
+    def _respond(self, method):
+        self.calls.append(method)
+        response = self.responses.get(method)
+        if isinstance(response, BaseException):
+            raise response
+        return response
+
+    def save_history(self):
+        return self._respond('save_history')
+
+    def load_history(self):
+        return self._respond('load_history')
+
+    def show_history(self):
+        return self._respond('show_history')
+
+    def clear_history(self):
+        return self._respond('clear_history')
+
+    def undo(self):
+        return self._respond('undo')
+
+    def redo(self):
+        return self._respond('redo')
+
+    def set_operation(self, operation):
+        return self._respond('set_operation')
+
+    def perform_operation(self, a, b):
+        return self._respond('perform_operation')
+
+
+@pytest.fixture
+def fake_calc(default_config):
+    """A _FakeCalculator to hand to calculator_repl in place of a real one."""
+    return _FakeCalculator(default_config)
+
 
 class TestREPLEssentials:
     """Essential REPL tests for high coverage without redundancy."""
 
-    def test_save_command_exception_handling(self):
-        """Test save command exception handling."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['save', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.save_history') as mock_save:
-                        mock_save.side_effect = Exception("Save failed")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mError saving history: Save failed")
-
-    def test_load_command_exception_handling(self):
-        """Test load command exception handling."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['load', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.load_history') as mock_load:
-                        mock_load.side_effect = Exception("Load failed")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mError loading history: Load failed")
-
-    def test_validation_error_in_operation(self):
-        """Test ValidationError handling in arithmetic operations."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['add', 'invalid', '3', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.perform_operation') as mock_perform:
-                        mock_perform.side_effect = ValidationError("Invalid input")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mError: Invalid input")
-
-    def test_operation_error_in_operation(self):
-        """Test OperationError handling in arithmetic operations."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['divide', '5', '0', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.perform_operation') as mock_perform:
-                        mock_perform.side_effect = OperationError("Division by zero")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mError: Division by zero")
-
-    def test_unexpected_error_in_operation(self):
-        """Test unexpected exception handling in arithmetic operations."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['multiply', '2', '3', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.perform_operation') as mock_perform:
-                        mock_perform.side_effect = RuntimeError("System error")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mUnexpected error: System error")
-
-    def test_unknown_command(self):
+    @pytest.fixture(autouse=True)
+    def _mute_init(self, monkeypatch):
+        """Skip colorama initialization, which every test would otherwise repeat."""
+        monkeypatch.setattr('app.calculator_repl.init', lambda *args, **kwargs: None)
+
+    @pytest.mark.parametrize("inputs, method, error, expected", [
+        (['save', 'exit'], 'save_history', Exception("Save failed"),
+         "Error saving history: Save failed"),
+        (['load', 'exit'], 'load_history', Exception("Load failed"),
+         "Error loading history: Load failed"),
+        (['add', 'invalid', '3', 'exit'], 'perform_operation', ValidationError("Invalid input"),
+         "Error: Invalid input"),
+        (['divide', '5', '0', 'exit'], 'perform_operation', OperationError("Division by zero"),
+         "Error: Division by zero"),
+        (['multiply', '2', '3', 'exit'], 'perform_operation', RuntimeError("System error"),
+         "Unexpected error: System error"),
+        (['exit'], 'save_history', Exception("Exit save failed"),
+         "Warning: Could not save history: Exit save failed"),
+    ], ids=['save', 'load', 'validation_error', 'operation_error', 'unexpected_error', 'exit_save'])
+    def test_error_paths(self, inputs, method, error, expected, fake_calc, feed_input, print_capture):
+        """Test that a failing Calculator method is reported and the REPL keeps going."""
+        fake_calc.responses[method] = error
+        feed_input(inputs)
+        calculator_repl(fake_calc)
+        
+        assert (expected,) in print_capture.lines
+
+    def test_unknown_command(self, fake_calc, feed_input, print_capture):
         """Test unknown command handling."""
-        from app.calculator_repl import calculator_repl
+        feed_input(['badcommand', 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input', side_effect=['badcommand', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("\x1b[31mUnknown command: 'badcommand'. Type 'help' for available commands.")
-
-    def test_save_history_on_exit_failure(self):
-        """Test save history exception during exit."""
-        from app.calculator_repl import calculator_repl
+        assert ("Unknown command: 'badcommand'. Type 'help' for available commands.",) in print_capture.lines
+
+    def test_empty_input_reprompts(self, fake_calc, feed_input, print_capture):
+        """Test blank input is skipped without an unknown command error."""
+        answers = feed_input(['', '   ', 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input', side_effect=['exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.save_history') as mock_save:
-                        mock_save.side_effect = Exception("Exit save failed")
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mWarning: Could not save history: Exit save failed")
-
-    def test_keyboard_interrupt_handling(self):
+        # All three prompts were answered
+        assert next(answers, None) is None
+        assert not any(args and "Unknown command" in str(args[0]) for args in print_capture.lines)
+
+    def test_keyboard_interrupt_handling(self, fake_calc, feed_input, print_capture):
         """Test KeyboardInterrupt (Ctrl+C) handling."""
-        from app.calculator_repl import calculator_repl
+        feed_input([KeyboardInterrupt(), 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input') as mock_input:
-            mock_input.side_effect = [KeyboardInterrupt(), 'exit']
-            
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("\n\x1b[31mOperation cancelled")
-
-    def test_eof_error_handling(self):
+        assert ("\nOperation cancelled",) in print_capture.lines
+
+    def test_eof_error_handling(self, fake_calc, feed_input, print_capture):
         """Test EOFError (Ctrl+D) handling."""
-        from app.calculator_repl import calculator_repl
+        feed_input([EOFError()])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input') as mock_input:
-            mock_input.side_effect = EOFError()
-            
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("\n\x1b[31mInput terminated. Exiting...")
-
-    def test_general_exception_in_loop(self):
-        """Test general exception handling in main loop."""
-        from app.calculator_repl import calculator_repl
+        assert ("\nInput terminated. Exiting...",) in print_capture.lines
+
+    @patch('app.history.BufferedAutoSaveObserver.flush')
+    def test_eof_flushes_buffered_autosave(self, mock_flush, feed_input, print_capture):
+        """Test EOF saves calculations still buffered by auto-save."""
+        feed_input(['add', '2', '3', EOFError()])
+        calculator_repl()
         
-        with patch('builtins.input') as mock_input:
-            mock_input.side_effect = [Exception("Random error"), 'exit']
-            
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("\x1b[31mError: Random error")
-
-    def test_fatal_error_during_initialization(self):
+        mock_flush.assert_called_once()
+
+    @patch('app.history.BufferedAutoSaveObserver.flush', side_effect=Exception("Disk full"))
+    def test_eof_flush_failure(self, mock_flush, feed_input, print_capture):
+        """Test EOF still exits when saving buffered calculations fails."""
+        feed_input([EOFError()])
+        calculator_repl()
+        
+        assert ("Warning: Could not save history: Disk full",) in print_capture.lines
+
+    def test_general_exception_in_loop(self, fake_calc, feed_input, print_capture):
+        """Test unexpected exception from a command handler is reported and the REPL keeps going."""
+        fake_calc.responses['show_history'] = Exception("Random error")
+        feed_input(['history', 'exit'])
+        calculator_repl(fake_calc)
+        
+        assert ("Error: Random error",) in print_capture.lines
+        assert ("Goodbye!",) in print_capture.lines
+
+    @patch('app.calculator_repl.logging.error')
+    @patch('app.calculator_repl.Calculator', side_effect=Exception("Fatal init error"))
+    def test_fatal_error_during_initialization(self, mock_calc_class, mock_log, print_capture):
         """Test fatal error handling during initialization."""
-        from app.calculator_repl import calculator_repl
+        with pytest.raises(Exception, match="Fatal init error"):
+            calculator_repl()
         
-        with patch('app.calculator_repl.Calculator') as mock_calc_class:
-            mock_calc_class.side_effect = Exception("Fatal init error")
-            
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.logging.error') as mock_log:
-                    with patch('app.calculator_repl.init'):
-                        
-                        with pytest.raises(Exception, match="Fatal init error"):
-                            calculator_repl()
-                        
-                        mock_print.assert_any_call("\x1b[31mFatal error: Fatal init error")
-                        mock_log.assert_called_once_with("Fatal error in calculator REPL: Fatal init error")
-
-    def test_cancel_at_first_number_input(self):
+        assert ("Fatal error: Fatal init error",) in print_capture.lines
+        mock_log.assert_called_once_with("Fatal error in calculator REPL: %s", mock_calc_class.side_effect)
+
+    def test_cancel_at_first_number_input(self, fake_calc, feed_input, print_capture):
         """Test cancelling operation at first number input."""
-        from app.calculator_repl import calculator_repl
+        feed_input(['add', 'cancel', 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input', side_effect=['add', 'cancel', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("Operation cancelled")
-
-    def test_cancel_at_second_number_input(self):
+        assert ("Operation cancelled",) in print_capture.lines
+
+    def test_cancel_at_second_number_input(self, fake_calc, feed_input, print_capture):
         """Test cancelling operation at second number input."""
-        from app.calculator_repl import calculator_repl
+        feed_input(['subtract', '5', ' Cancel ', 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input', side_effect=['subtract', '5', 'cancel', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("Operation cancelled")
-
-    def test_non_decimal_result_formatting(self):
+        assert ("Operation cancelled",) in print_capture.lines
+
+    def test_non_decimal_result_formatting(self, fake_calc, feed_input, print_capture):
         """Test formatting when result is not a Decimal."""
-        from app.calculator_repl import calculator_repl
+        fake_calc.responses['perform_operation'] = "string_result"
+        feed_input(['add', '2', '3', 'exit'])
+        calculator_repl(fake_calc)
         
-        with patch('builtins.input', side_effect=['add', '2', '3', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.perform_operation') as mock_perform:
-                        mock_perform.return_value = "string_result"
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("\nResult: string_result")
-
-    def test_help_command(self):
+        assert ("\nResult: string_result",) in print_capture.lines
+
+    def test_help_command(self, fake_calc, feed_input, print_capture):
         """Test help command displaying all available commands."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['help', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    
-                    calculator_repl()
-                    
-                    mock_print.assert_any_call("\nAvailable commands:")
-                    mock_print.assert_any_call("  Arithmetic Operations:")
-                    mock_print.assert_any_call("    add (a, +) - Addition")
-
-    def test_empty_history_display(self):
-        """Test history command when history is empty."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['history', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.show_history') as mock_history:
-                        mock_history.return_value = []
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("No calculations in history")
-
-    def test_clear_command_success(self):
-        """Test clear command clearing calculation history."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['clear', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.clear_history') as mock_clear:
-                        
-                        calculator_repl()
-                        
-                        mock_clear.assert_called_once()
-                        mock_print.assert_any_call("History cleared")
-
-    def test_undo_command_success(self):
-        """Test undo command with successful undo."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['undo', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.undo') as mock_undo:
-                        mock_undo.return_value = True
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("Operation undone")
-
-    def test_undo_command_nothing_to_undo(self):
-        """Test undo command when nothing to undo."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['undo', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.undo') as mock_undo:
-                        mock_undo.return_value = False
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("Nothing to undo")
-
-    def test_redo_command_success(self):
-        """Test redo command with successful redo."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['redo', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.redo') as mock_redo:
-                        mock_redo.return_value = True
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("Operation redone")
-
-    def test_redo_command_nothing_to_redo(self):
-        """Test redo command when nothing to redo."""
-        from app.calculator_repl import calculator_repl
-        
-        with patch('builtins.input', side_effect=['redo', 'exit']):
-            with patch('builtins.print') as mock_print:
-                with patch('app.calculator_repl.init'):
-                    with patch('app.calculator.Calculator.redo') as mock_redo:
-                        mock_redo.return_value = False
-                        
-                        calculator_repl()
-                        
-                        mock_print.assert_any_call("Nothing to redo")
\ No newline at end of file
+        feed_input(['help', 'exit'])
+        calculator_repl(fake_calc)
+        
+        # Help text is printed as a single block
+        output = "\n".join(str(args[0]) for args in print_capture.lines if args)
+        assert "\nAvailable commands:" in output
+        assert "  Arithmetic Operations:" in output
+        assert "    add (a, +) - Addition" in output
+
+    @pytest.mark.parametrize("command, method, retval, expected", [
+        ('history', 'show_history', [], "No calculations in history"),
+        ('clear', 'clear_history', None, "History cleared"),
+        ('undo', 'undo', True, "Operation undone"),
+        ('undo', 'undo', False, "Nothing to undo"),
+        ('redo', 'redo', True, "Operation redone"),
+        ('redo', 'redo', False, "Nothing to redo"),
+    ], ids=['empty_history', 'clear', 'undo', 'nothing_to_undo', 'redo', 'nothing_to_redo'])
+    def test_system_commands(self, command, method, retval, expected, fake_calc, feed_input, print_capture):
+        """Test each history command calls its Calculator method once and reports the outcome."""
+        fake_calc.responses[method] = retval
+        feed_input([command, 'exit'])
+        calculator_repl(fake_calc)
+        
+        # The command's own call, then the save made on exit
+        assert fake_calc.calls == [method, 'save_history']
+        assert (expected,) in print_capture.lines